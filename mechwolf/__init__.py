@@ -1,7 +1,13 @@
+from functools import lru_cache
+
 from pint import UnitRegistry
 
 # unit registry for conversions
-_ureg = UnitRegistry(autoconvert_offset_to_baseunit=True)
+_ureg: UnitRegistry = UnitRegistry(autoconvert_offset_to_baseunit=True)
+
+# parsing is slow and the same few strings (e.g. "0 seconds") are parsed constantly
+# NOTE: the returned quantities are shared, so never mutate them in place (e.g. ito())
+_parse = lru_cache(maxsize=1024)(_ureg.parse_expression)
 import pkg_resources
 
 __version__ = pkg_resources.get_distribution("mechwolf").version
@@ -3,7 +3,7 @@ from typing import Any, Dict, Optional
 
 from loguru import logger
 
-from . import _ureg
+from . import _parse, _ureg
 from .component import Component
 
 
@@ -46,7 +46,7 @@ class ActiveComponent(Component):
         """
         for key, value in params.items():
             if isinstance(getattr(self, key), _ureg.Quantity):
-                setattr(self, key, _ureg.parse_expression(value))
+                setattr(self, key, _parse(value))
             else:
                 setattr(self, key, value)
 
@@ -85,14 +85,13 @@ class ActiveComponent(Component):
             # dimensionality checking
             if isinstance(self.__dict__[k], _ureg.Quantity):
                 # figure out the dimensions we're comparing
-                expected_dim = _ureg.parse_expression(v).dimensionality
+                expected_dim = _parse(v).dimensionality
                 actual_dim = self.__dict__[k].dimensionality
 
                 if expected_dim != actual_dim:
                     raise ValueError(
                         f"Invalid dimensionality in _base_state for {repr(self)}. "
-                        f"Got {_ureg.parse_expression(v).dimensionality} for {k}, "
-                        f"expected {self.__dict__[k].dimensionality}"
+                        f"Got {expected_dim} for {k}, expected {actual_dim}"
                     )
 
             # if not dimensional, do type matching
@@ -1,7 +1,10 @@
 from math import pi
 from warnings import warn
 
-from . import _ureg
+from . import _parse, _ureg
+
+# every measurement of a tube must be a length
+_LENGTH_DIMENSIONALITY = _ureg.mm.dimensionality
 
 
 class Tube(object):
@@ -24,6 +27,17 @@ class Tube(object):
         - ValueError: When the outer diameter is less than the inner diameter of the tube.
     """
 
+    # apparatuses can have lots of tubes, so skip the per-instance __dict__
+    __slots__ = (
+        "length",
+        "ID",
+        "OD",
+        "material",
+        "volume",
+        "_length_mm",
+        "_volume_mm3",
+    )
+
     def __init__(self, length: str, ID: str, OD: str, material: str):
         """
         See the `Tube` attributes for a description of the arguments.
@@ -32,13 +46,13 @@ class Tube(object):
         The arguments to __init__ are `str`s, not `pint.Quantity`s.
         :::
         """
-        self.length = _ureg.parse_expression(length)
-        self.ID = _ureg.parse_expression(ID)
-        self.OD = _ureg.parse_expression(OD)
+        self.length = _parse(length)
+        self.ID = _parse(ID)
+        self.OD = _parse(OD)
 
         # check to make sure units are valid
         for measurement in [self.length, self.ID, self.OD]:
-            if measurement.dimensionality != _ureg.mm.dimensionality:
+            if measurement.dimensionality != _LENGTH_DIMENSIONALITY:
                 raise ValueError(
                     f"{measurement.units} is an invalid unit of measurement for length."
                 )
@@ -55,7 +69,12 @@ class Tube(object):
             )
 
         self.material = material
-        self.volume = pi * ((self.ID / 2) ** 2) * self.length
+
+        # do the arithmetic on plain floats (in mm) rather than through pint
+        id_mm = self.ID.to(_ureg.mm).magnitude
+        self._length_mm = self.length.to(_ureg.mm).magnitude
+        self._volume_mm3 = pi * (id_mm / 2) ** 2 * self._length_mm
+        self.volume = self._volume_mm3 * _ureg.mm ** 3
 
     def __repr__(self):
         return f"Tube of length {self.length}, ID {self.ID}, OD {self.OD}"
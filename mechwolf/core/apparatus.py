@@ -1,15 +1,17 @@
 from collections import namedtuple
-from typing import Iterable, List, Mapping, Optional, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Union
 from warnings import warn
 
 import networkx as nx
 from IPython import get_ipython
 from IPython.display import Markdown
-from graphviz import Digraph
-from terminaltables import AsciiTable, GithubFlavoredMarkdownTable
 
 from .. import _ureg
-from ..components import Component, Tube, Valve, Vessel
+from ..components import ActiveComponent, Component, Tube, Valve, Vessel
+
+# graphviz is only imported when visualizing, but we still want type hints
+if TYPE_CHECKING:
+    from graphviz import Digraph
 
 Connection = namedtuple("Connection", ["from_component", "to_component", "tube"])
 
@@ -27,10 +29,11 @@ class Apparatus(object):
     - `description`: A description of the apparatus. Can be as long and wordy as you want.
 
     Attributes:
-    - `components`: A set containing the components that make up the apparatus.
+    - `active_components`: A list of the `ActiveComponent`s in the apparatus. Treat it as read-only.
+    - `components`: A dict whose keys are the components that make up the apparatus, in the order they were added. Use `add()` to change it.
     - `description`: A description of the apparatus. Can be as long and wordy as you want.
     - `name`: The name of the apparatus. Defaults to "Apparatus_X" where *X* is apparatus count. This should be short and sweet.
-    - `network`: A list of tuples in the form `(from_component, to_component, tube)` describing the configuration of the apparatus.
+    - `network`: A list of tuples in the form `(from_component, to_component, tube)` describing the configuration of the apparatus. Use `add()` to change it.
     """
 
     _id_counter = 0
@@ -40,7 +43,8 @@ class Apparatus(object):
         See the main docstring.
         """
         self.network: List[Connection] = []
-        self.components: Set[Component] = set()
+        # a dict (with None values) rather than a set so that iteration is ordered
+        self.components: Dict[Component, None] = {}
         # if given a name, then name the apparatus, else default to a sequential name
         if name is not None:
             self.name = name
@@ -52,6 +56,11 @@ class Apparatus(object):
     def __repr__(self):
         return f"<Apparatus {self.name}>"
 
+    @property
+    def active_components(self) -> List[ActiveComponent]:
+        """The `ActiveComponent`s of the apparatus, in the order they were added."""
+        return self[ActiveComponent]
+
     def __str__(self):
         return f"Apparatus {self.name}"
 
@@ -120,7 +129,8 @@ class Apparatus(object):
                 from_component=from_component, to_component=to_component, tube=tube
             )
         )
-        self.components.update([from_component, to_component])
+        self.components[from_component] = None
+        self.components[to_component] = None
 
     def add(
         self,
@@ -179,7 +189,7 @@ class Apparatus(object):
         file_format: str = "pdf",
         filename: Optional[str] = None,
         **kwargs,
-    ) -> Optional[Digraph]:
+    ) -> Optional["Digraph"]:
         """
         Generates a visualization of an apparatus's network graph.
 
@@ -196,6 +206,9 @@ class Apparatus(object):
         - `rankdir`: The direction of the graph. Use `LR` for left to right and `TD` for top down.
         - `title`: Whether to show the title in the output. Defaults to True. If a string, the title to use for the output.
         """
+        # deferred to keep `import mechwolf` fast
+        from graphviz import Digraph
+
         f = Digraph(
             name=self.name,
             node_attr=node_attr,
@@ -209,7 +222,7 @@ class Apparatus(object):
         # go from left to right adding components and their tubing connections
         f.attr(rankdir=rankdir)
 
-        for component in sorted(list(self.components), key=lambda x: x.name):
+        for component in sorted(self.components, key=lambda x: x.name):
             f.attr("node", shape=component._visualization_shape)
             f.node(
                 component.description
@@ -255,6 +268,8 @@ class Apparatus(object):
         Returns:
         - In Jupyter, a nice HTML table. Otherwise, the output is printed to the terminal.
         """
+        # deferred to keep `import mechwolf` fast
+        from terminaltables import AsciiTable, GithubFlavoredMarkdownTable
 
         if style == "ascii":
             tableStyle = AsciiTable
@@ -284,11 +299,12 @@ class Apparatus(object):
         ]  # header row
 
         # store and calculate the computed totals for tubing
-        total_length = 0 * _ureg.mm
-        total_volume = 0 * _ureg.ml
+        # sum the tubes' precomputed floats (in mm and mm³) to avoid pint per tube
+        total_length_mm = 0.0
+        total_volume_mm3 = 0.0
         for connection in self.network:
-            total_length += connection.tube.length
-            total_volume += connection.tube.volume
+            total_length_mm += connection.tube._length_mm
+            total_volume_mm3 += connection.tube._volume_mm3
 
             summary.append(
                 [
@@ -305,10 +321,10 @@ class Apparatus(object):
             [
                 "**Total**" if style == "gfm" else "Total",
                 "n/a",
-                round(total_length, 4),
+                round(total_length_mm * _ureg.mm, 4),
                 "n/a",
                 "n/a",
-                round(total_volume.to("ml"), 4),
+                round((total_volume_mm3 * _ureg.mm ** 3).to("ml"), 4),
                 "n/a",
             ]
         )  # footer row
@@ -348,7 +364,7 @@ class Apparatus(object):
 
         # make sure that all of the components are connected
         G = nx.Graph()  # convert the network to an undirected NetworkX graph
-        G.add_edges_from([(c.from_component, c.to_component) for c in self.network])
+        G.add_edges_from((c.from_component, c.to_component) for c in self.network)
         if not nx.is_connected(G):
             warn("Not all components connected.")
             return False
@@ -401,9 +417,9 @@ class Apparatus(object):
 
         def _description(element, capitalize=False):
             """takes a component and converts it to a string description"""
-            if issubclass(element.__class__, Vessel):
+            if isinstance(element, Vessel):
                 return f"{'A' if capitalize else 'a'} vessel containing {element.description}"
-            elif issubclass(element.__class__, Component):
+            elif isinstance(element, Component):
                 return element.__class__.__name__ + " " + element.name
             else:
                 raise RuntimeError(
@@ -411,20 +427,21 @@ class Apparatus(object):
                     " If you're seeing this message, something *very* wrong has happened."
                 )
 
-        result = ""
-
         # iterate over the network and describe the connections
+        sentences = []
         for connection in self.network:
             from_component, to_component, tube = (
                 _description(connection.from_component, capitalize=True),
                 _description(connection.to_component),
                 connection.tube,
             )
-            result += (
+            sentences.append(
                 f"{from_component} was connected to"
-                f" {to_component} using {connection[2].material}"
+                f" {to_component} using {tube.material}"
                 f" tubing (length {tube.length}, ID {tube.ID}, OD {tube.OD}). "
             )
+        result = "".join(sentences)
+
         if get_ipython():
             return Markdown(result)
         return result
@@ -7,10 +7,6 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from warnings import warn
 
 import aiofiles
-import ipywidgets as widgets
-from bokeh.io import output_notebook, push_notebook, show
-from bokeh.plotting import figure
-from bokeh.resources import INLINE
 from IPython import get_ipython
 from IPython.display import display
 from loguru import logger
@@ -120,6 +116,11 @@ class Experiment(object):
         if get_ipython() is None:
             return
 
+        # bokeh is slow to import and only needed for the live graphs in Jupyter
+        from bokeh.io import output_notebook, push_notebook, show
+        from bokeh.plotting import figure
+        from bokeh.resources import INLINE
+
         if not self._graphs_shown:
             logger.debug("Graphs not shown. Initializing...")
             for sensor, output in self._sensor_outputs.items():  # type: ignore
@@ -272,6 +273,8 @@ class Experiment(object):
             asyncio.run(main(experiment=self, dry_run=dry_run, strict=strict))
 
     def _display(self, verbosity: str, strict: bool):
+        # the widgets are only needed in Jupyter, so don't import them until then
+        import ipywidgets as widgets
 
         # create pause button
         self._pause_button = widgets.Button(description="Pause", icon="pause")
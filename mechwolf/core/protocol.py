@@ -1,24 +1,55 @@
 import json
 import os
-from copy import deepcopy
+from collections import defaultdict
 from datetime import timedelta
+from functools import lru_cache
 from math import isclose
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Union
+from operator import itemgetter
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Union,
+    cast,
+)
 from warnings import warn
 
-import altair as alt
-import pandas as pd
-import yaml
 from IPython import get_ipython
 from IPython.display import Code
 from loguru import logger
 
-from .. import _ureg
+from .. import _parse, _ureg
 from ..components import ActiveComponent, TempControl, Valve
 from .apparatus import Apparatus
 from .experiment import Experiment
 
 
+@lru_cache(maxsize=1024)
+def _to_seconds(time: str) -> float:
+    """Converts a time string, such as "5 min", to float seconds."""
+    return float(_parse(time).to(_ureg.seconds).magnitude)
+
+
+def _time_arg_to_seconds(name: str, time: Any) -> float:
+    """Converts a start, stop, or duration argument to float seconds."""
+    if isinstance(time, timedelta):
+        return time.total_seconds()
+    try:
+        if isinstance(time, str):
+            return _to_seconds(time)
+        return float(time.to(_ureg.seconds).magnitude)
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(
+            f"Invalid {name} {repr(time)}. "
+            "Expected a time, such as '5 seconds', or a datetime.timedelta."
+        )
+
+
 class Protocol(object):
     """
     A set of procedures for an apparatus.
@@ -91,18 +122,20 @@ class Protocol(object):
         if valve.mapping is None:
             raise ValueError(f"{repr(valve)} does not have a mapping.")
 
+        # the mapping keyed by component name instead of component
+        # we don't have to worry about duplicate names since that's checked later
+        ports_by_name = {c.name: port for c, port in valve.mapping.items()}
+
         # the valve itself was given
         if setting in valve.mapping:
             logger.trace(f"{setting} in {repr(valve)}'s mapping.")
             kwargs["setting"] = valve.mapping[setting]
 
         # the valve's name was given
-        # in this case, we get the mapped valve with that name
-        # we don't have to worry about duplicate names since that's checked later
-        elif setting in [c.name for c in valve.mapping]:
+        # in this case, we get the port of the mapped valve with that name
+        elif setting in ports_by_name:
             logger.trace(f"{setting} in {repr(valve)}'s mapping.")
-            mapped_component = [c for c in valve.mapping if c.name == setting]
-            kwargs["setting"] = valve.mapping[mapped_component[0]]
+            kwargs["setting"] = ports_by_name[setting]
 
         # the user gave the actual port mapping number
         elif setting in valve.mapping.values() and isinstance(setting, int):
@@ -114,11 +147,12 @@ class Protocol(object):
 
     def _check_component_kwargs(self, component: ActiveComponent, **kwargs) -> None:
         """Checks that the given keyword arguments are valid for a component."""
+        attrs = vars(component)
         for kwarg, value in kwargs.items():
             # check that the component even has the attribute
-            if not hasattr(component, kwarg):
+            if kwarg not in attrs:
                 # id nor determine valid attrs for the error message
-                valid_attrs = [x for x in vars(component).keys()]
+                valid_attrs = [x for x in attrs.keys()]
                 # we don't care about the name attr
                 valid_attrs = [x for x in valid_attrs if x != "name"]
                 # or internal ones
@@ -128,13 +162,15 @@ class Protocol(object):
                 msg += f"Valid attributes are {valid_attrs}"
                 raise ValueError(msg)
 
+            current = attrs[kwarg]
+
             # for kwargs that will be converted later, just check that the units match
-            if isinstance(component.__dict__[kwarg], _ureg.Quantity):
+            if isinstance(current, _ureg.Quantity):
                 try:
-                    value_dim = _ureg.parse_expression(value).dimensionality
-                except AttributeError:
+                    value_dim = _parse(value).dimensionality
+                except (AttributeError, TypeError):
                     value_dim = type(value)
-                kwarg_dim = component.__dict__[kwarg].dimensionality
+                kwarg_dim = current.dimensionality
 
                 # perform the check
                 if value_dim != kwarg_dim:
@@ -143,8 +179,8 @@ class Protocol(object):
                     raise ValueError(msg)
 
             # if it's not a quantity, check the types
-            elif not isinstance(value, type(component.__dict__[kwarg])):
-                expected_type = type(component.__dict__[kwarg])
+            elif not isinstance(value, type(current)):
+                expected_type = type(current)
                 msg = "Bad type matching. "
                 msg += f"Expected '{kwarg}' to an instance of {expected_type} but got"
                 msg += f"{repr(value)}, which is of type {type(value)}."
@@ -180,22 +216,18 @@ class Protocol(object):
             raise RuntimeError("Must provide one of stop and duration, not both.")
 
         # parse the start time if given
-        if isinstance(start, timedelta):
-            start = str(start.total_seconds()) + " seconds"
-        elif start is None:  # default to the beginning of the protocol
-            start = "0 seconds"
-        start = _ureg.parse_expression(start)
+        # NOTE: times are converted to float seconds right away so that the
+        # arithmetic and comparisons below (and in _compile) don't go through pint
+        if start is None:  # default to the beginning of the protocol
+            start = 0.0
+        else:
+            start = _time_arg_to_seconds("start", start)
 
         # parse duration if given
         if duration is not None:
-            if isinstance(duration, timedelta):
-                duration = str(duration.total_seconds()) + " seconds"
-            stop = start + _ureg.parse_expression(duration)
+            stop = start + _time_arg_to_seconds("duration", duration)
         elif stop is not None:
-            if isinstance(stop, timedelta):
-                stop = str(stop.total_seconds()) + " seconds"
-            if isinstance(stop, str):
-                stop = _ureg.parse_expression(stop)
+            stop = _time_arg_to_seconds("stop", stop)
 
         if stop is not None and start > stop:
             raise ValueError("Procedure beginning is after procedure end.")
@@ -214,16 +246,7 @@ class Protocol(object):
 
         # add the procedure to the procedure list
         self.procedures.append(
-            dict(
-                start=float(start.to_base_units().magnitude)
-                if start is not None
-                else start,
-                stop=float(stop.to_base_units().magnitude)
-                if stop is not None
-                else stop,
-                component=component,
-                params=kwargs,
-            )
+            dict(start=start, stop=stop, component=component, params=kwargs)
         )
 
     def add(
@@ -250,7 +273,7 @@ class Protocol(object):
 
         Raises:
         - `TypeError`: A component is not of the correct type (*i.e.* a Component object)
-        - `ValueError`: An error occurred when attempting to parse the kwargs.
+        - `ValueError`: An error occurred when attempting to parse the kwargs or the start, stop, or duration.
         - `RuntimeError`: Stop time of procedure is unable to be determined or invalid component.
         """
 
@@ -267,16 +290,13 @@ class Protocol(object):
     @property
     def _inferred_duration(self):
         # infer the duration of the protocol
-        computed_durations = sorted(
-            [x["stop"] for x in self.procedures],
-            key=lambda z: z if z is not None else 0,
-        )
-        if all([x is None for x in computed_durations]):
+        stops = [x["stop"] for x in self.procedures if x["stop"] is not None]
+        if not stops:
             raise RuntimeError(
                 "Unable to automatically infer duration of protocol. "
                 "Must define stop or duration for at least one procedure"
             )
-        return computed_durations[-1]
+        return max(stops)
 
     def _compile(
         self, dry_run: bool = True, _visualization: bool = False
@@ -293,13 +313,20 @@ class Protocol(object):
         """
         output = {}
 
+        # group the procedures by component in a single pass
+        procedures_by_component: DefaultDict[
+            ActiveComponent, List[MutableMapping]
+        ] = defaultdict(list)
+        for entry in self.procedures:
+            component = cast(ActiveComponent, entry["component"])
+            procedures_by_component[component].append(entry)
+
         # deal only with compiling active components
-        for component in self.apparatus[ActiveComponent]:
+        for component in self.apparatus.active_components:
             # determine the procedures for each component
-            component_procedures: List[MutableMapping] = sorted(
-                [x for x in self.procedures if x["component"] == component],
-                key=lambda x: x["start"],
-            )
+            # the buckets are fresh lists, so they can be sorted in place
+            component_procedures = procedures_by_component.get(component, [])
+            component_procedures.sort(key=itemgetter("start"))
 
             # skip compiling components without procedures
             if not len(component_procedures):
@@ -334,9 +361,10 @@ class Protocol(object):
                     ""
                 )
 
+            last = len(component_procedures) - 1
             for i, procedure in enumerate(component_procedures):
                 # automatically infer start and stop times
-                try:
+                if i < last:
                     # the start time of the next procedure
                     next_start = component_procedures[i + 1]["start"]
                     if next_start == 0:
@@ -358,13 +386,12 @@ class Protocol(object):
                         msg += f"{procedure} and {component_procedures[i + 1]} conflict"
                         raise RuntimeError(msg)
 
-                except IndexError:
-                    if procedure["stop"] is None:
-                        warn(
-                            f"Automatically inferring stop for {procedure['component']} as the end of the protocol. "
-                            f"To override, provide stop in your call to add()."
-                        )
-                        procedure["stop"] = self._inferred_duration
+                elif procedure["stop"] is None:
+                    warn(
+                        f"Automatically inferring stop for {procedure['component']} as the end of the protocol. "
+                        f"To override, provide stop in your call to add()."
+                    )
+                    procedure["stop"] = self._inferred_duration
 
             # give the component instructions at all times
             compiled = []
@@ -384,13 +411,10 @@ class Protocol(object):
 
                     # if the procedure is over at the same time as the next
                     # procedure begins, don't go back to the base state
-                    try:
-                        if isclose(
-                            component_procedures[i + 1]["start"], procedure["stop"]
-                        ):
-                            continue
-                    except IndexError:
-                        pass
+                    if i < last and isclose(
+                        component_procedures[i + 1]["start"], procedure["stop"]
+                    ):
+                        continue
 
                     # otherwise, go back to base state
                     new_state = {
@@ -402,19 +426,30 @@ class Protocol(object):
             output[component] = compiled
 
             # raise warning if duration is explicitly given but not used?
+
         return output
 
     def to_dict(self):
-        compiled = deepcopy(self._compile(dry_run=True))
-        compiled = {k.name: v for (k, v) in compiled.items()}
-        return compiled
+        # the compiled params are shared with the procedures and the components' base
+        # states, so copy them to keep callers from modifying either
+        return {
+            component.name: [
+                dict(procedure, params=dict(procedure["params"]))
+                for procedure in procedures
+            ]
+            for component, procedures in self._compile(dry_run=True).items()
+        }
 
     def to_list(self):
-        output = []
-        for procedure in deepcopy(self.procedures):
-            procedure["component"] = procedure["component"].name
-            output.append(procedure)
-        return output
+        # build fresh dicts instead of deepcopying, which would copy the components too
+        return [
+            dict(
+                procedure,
+                component=procedure["component"].name,
+                params=dict(procedure["params"]),
+            )
+            for procedure in self.procedures
+        ]
 
     def yaml(self) -> Union[str, Code]:
         """
@@ -427,6 +462,8 @@ class Protocol(object):
         When in Jupyter, this string is wrapped in an `IPython.display.Code` object for nice syntax highlighting.
 
         """
+        import yaml
+
         compiled_yaml = yaml.safe_dump(self.to_list(), default_flow_style=False)
 
         if get_ipython():
@@ -459,12 +496,23 @@ class Protocol(object):
         Returns:
         - An interactive visualization of the protocol.
         """
+        # deferred to keep `import mechwolf` fast
+        import altair as alt
+        import pandas as pd
 
         # don't try to render a visualization to the notebook if we're not in one
         if get_ipython():
             alt.renderers.enable(renderer)
 
+        chart: Any = None
         for component, procedures in self._compile(_visualization=True).items():
+            # for valves, map each port back to the component on it once up front
+            if isinstance(component, Valve):
+                assert isinstance(component.mapping, Mapping)
+                port_to_component: Dict[int, str] = {}
+                for mapped, port in component.mapping.items():
+                    port_to_component.setdefault(port, repr(mapped))
+
             # generate a dict that will be a row in the dataframe
             for procedure in procedures:
                 procedure["component"] = str(component)
@@ -477,17 +525,14 @@ class Protocol(object):
                     procedure[k] = v
 
                 # show what the valve is actually connecting to
-                if isinstance(component, Valve) and type(procedure["setting"]) == int:
-                    assert isinstance(component.mapping, Mapping)
-                    # guess the component, c, which the valve is set to
-                    mapped_component = [
-                        repr(k)
-                        for k, v in component.mapping.items()
-                        if v == procedure["setting"]
-                    ][0]
-                    procedure["mapped component"] = mapped_component
-                # TODO: make this deterministic for color coordination
-                procedure["params"] = json.dumps(procedure["params"])
+                if isinstance(component, Valve) and isinstance(
+                    procedure["setting"], int
+                ):
+                    procedure["mapped component"] = port_to_component[
+                        procedure["setting"]
+                    ]
+                # sort the keys so the same params always get the same color
+                procedure["params"] = json.dumps(procedure["params"], sort_keys=True)
 
             # prettyify the tooltips
             tooltips = [
@@ -526,10 +571,10 @@ class Protocol(object):
             component_chart.encoding.y.title = "Component"
 
             # combine with the other charts
-            try:
-                chart += component_chart  # type: ignore
-            except NameError:
+            if chart is None:
                 chart = component_chart
+            else:
+                chart += component_chart
 
         return chart.interactive()
 
@@ -1,6 +1,7 @@
 import pytest
 
 import mechwolf as mw
+from mechwolf.core.apparatus import Connection
 
 a, b, c, d = [mw.Component() for i in range(4)]
 t = mw.Tube(length="1 foot", ID="1 in", OD="2 in", material="PVC")
@@ -11,7 +12,7 @@ A = mw.Apparatus()
 def test_add_basic():
     A.add(a, b, t)
     assert A.network == [(a, b, t)]
-    assert A.components == {a, b}
+    assert list(A.components) == [a, b]
 
 
 def test_add_errors():
@@ -42,6 +43,21 @@ def test__validate():
     A.add(b, d, t)  # fully connected
     assert A._validate()
 
+    # connections added without add() are checked too
+    e, f = mw.Component(), mw.Component()
+    A.network.append(Connection(from_component=e, to_component=f, tube=t))
+    with pytest.warns(UserWarning, match="connect"):
+        assert not A._validate()
+    A.network.pop()
+
+    # as is replacing a connection without changing the size of the network
+    assert A._validate()
+    connection = A.network.pop()
+    A.network.append(Connection(from_component=e, to_component=f, tube=t))
+    with pytest.warns(UserWarning, match="connect"):
+        assert not A._validate()
+    A.network[-1] = connection
+
 
 def test_describe():
     C = mw.Apparatus()
@@ -50,3 +66,21 @@ def test_describe():
         C.describe()
         == "A vessel containing water was connected to Component Component_1 using PVC tubing (length 1 foot, ID 1 inch, OD 2 inch). "
     )
+
+
+def test_active_components():
+    D = mw.Apparatus()
+    pump = mw.Pump()
+    D.add(mw.Vessel("water"), pump, t)
+    assert D.active_components == [pump]
+
+    # adding a connection updates the list
+    valve = mw.Valve()
+    D.add(pump, valve, t)
+    assert D.active_components == [pump, valve]
+
+    # as does swapping a component without changing the number of components
+    other_pump = mw.Pump()
+    del D.components[pump]
+    D.components[other_pump] = None
+    assert D.active_components == [valve, other_pump]
@@ -87,6 +87,16 @@ def test_add():
     with pytest.raises(ValueError):
         P.add([pump1, pump2], rate="10 mL/min", start="5 min", stop="4 min")
 
+    # times that aren't times
+    with pytest.raises(ValueError, match="start"):
+        P.add(pump1, rate="10 mL/min", start="5 mL", stop="4 min")
+    with pytest.raises(ValueError, match="duration"):
+        P.add(pump1, rate="10 mL/min", duration="5")
+
+    # a stop that's neither a str, a timedelta, nor a Quantity
+    with pytest.raises(ValueError, match="stop"):
+        P.add(pump1, rate="10 mL/min", stop=5)
+
 
 def test_add_dummy():
     A = mw.Apparatus()
@@ -151,6 +161,27 @@ def test_compile():
         P._compile()
 
 
+def test_to_dict():
+    P = mw.Protocol(A)
+    P.add([pump1, pump2], rate="10 mL/min", duration="5 min")
+    compiled = P.to_dict()
+    assert compiled == {
+        "pump1": [
+            {"params": {"rate": "10 mL/min"}, "time": 0},
+            {"params": {"rate": "0 mL/min"}, "time": 300},
+        ],
+        "pump2": [
+            {"params": {"rate": "10 mL/min"}, "time": 0},
+            {"params": {"rate": "0 mL/min"}, "time": 300},
+        ],
+    }
+
+    # modifying the output mustn't change the protocol or the components
+    compiled["pump1"][1]["params"]["rate"] = "5 mL/min"
+    assert P.to_dict()["pump1"][1]["params"] == {"rate": "0 mL/min"}
+    assert pump1._base_state == {"rate": "0 mL/min"}
+
+
 def test_unused_component():
     # raise warning if component not used
     P = mw.Protocol(A)
@@ -1,3 +1,5 @@
+from math import pi
+
 import pytest
 
 import mechwolf as mw
@@ -19,3 +21,8 @@ def test_repr():
         str(mw.Tube(length="5 cm", ID="1 cm", OD="2 cm", material="boyfriend material"))
         == "Tube of length 5 centimeter, ID 1 centimeter, OD 2 centimeter"
     )
+
+
+def test_volume():
+    t = mw.Tube(length="10 cm", ID="2 mm", OD="3 mm", material="PFA")
+    assert t.volume.to("ml").magnitude == pytest.approx(0.1 * pi)